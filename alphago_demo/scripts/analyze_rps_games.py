@@ -6,131 +6,196 @@ This script runs multiple RPS card game AI vs AI demonstrations,
 collects statistics, and generates a report.
 """
 
+import io
 import os
+import pathlib
 import subprocess
 import re
-import time
-import matplotlib.pyplot as plt
+import tarfile
+import numpy as np
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 OUTPUT_DIR = "../output"
 NUM_GAMES = 10  # Number of games to analyze
 
+# Row/column layout of the per-game card-count arrays
+CARD_LABELS = ('Rock', 'Paper', 'Scissors')
+
+# Numba is optional - when present, long transcripts are counted by a
+# JIT-compiled single-pass scan instead of one substring search per token
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Only transcripts at least this large are worth the JIT dispatch overhead
+_JIT_MIN_BYTES = 1 << 20
+
+# The six card-play literals, in (player, card) order matching CARD_LABELS
+_CARD_TOKENS = [f'Player {player} plays {card}'.encode()
+                for player in (1, 2) for card in CARD_LABELS]
+
+if njit is not None:
+    _TOKEN_LENS = np.array([len(t) for t in _CARD_TOKENS], dtype=np.int64)
+    _TOKEN_MATRIX = np.zeros((len(_CARD_TOKENS), int(_TOKEN_LENS.max())), dtype=np.uint8)
+    for _t, _token in enumerate(_CARD_TOKENS):
+        _TOKEN_MATRIX[_t, :len(_token)] = np.frombuffer(_token, dtype=np.uint8)
+
+    @njit(cache=True)
+    def _scan_cards_jit(buf, tokens, token_lens):
+        """Count the six card-play literals in one pass over a byte buffer"""
+        counts = np.zeros(6, dtype=np.int64)
+        n = buf.shape[0]
+        for i in range(n):
+            if buf[i] == 80:  # ord('P') - every token starts with 'Player'
+                for t in range(6):
+                    token_len = token_lens[t]
+                    if i + token_len <= n:
+                        match = True
+                        for j in range(1, token_len):
+                            if buf[i + j] != tokens[t, j]:
+                                match = False
+                                break
+                        if match:
+                            counts[t] += 1
+                            break
+        return counts
+
+# Precompiled patterns - compiling once at import time avoids the per-call
+# pattern cache lookup inside re.findall. Bytes patterns so they can run
+# directly over a memory-mapped transcript without a UTF-8 decode pass.
+_RE_WINNER = re.compile(rb'Player ([12]) wins!')
+_RE_MOVE = re.compile(rb'Move (\d+)')
+_RE_PLAYS = re.compile(rb'Player ([12]) plays (Rock|Paper|Scissors)')
+
 def run_game():
-    """Run a single game in AI vs AI mode and return the output"""
+    """Run a single game in AI vs AI mode and return its transcript and stats"""
     cmd = 'cd .. && (echo "2" && echo "3") | ./bin/rps_card'
-    process = subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    stdout, stderr = process.communicate()
-    return stdout.decode('utf-8')
+    result = subprocess.run(cmd, shell=True, stdout=subprocess.PIPE,
+                            stderr=subprocess.DEVNULL, check=False)
+    return result.stdout, parse_game_output(result.stdout)
 
 def parse_game_output(output):
-    """Parse the game output to extract statistics"""
-    # Extract the winner
-    winner = "Draw"
-    if "Player 1 wins!" in output:
-        winner = "Player 1"
-    elif "Player 2 wins!" in output:
-        winner = "Player 2"
-    
-    # Extract number of moves
-    moves = re.findall(r'Move (\d+)', output)
-    num_moves = int(moves[-1]) if moves else 0
-    
-    # Extract card placements
-    player1_cards = Counter()
-    player2_cards = Counter()
-    
-    rock_p1 = len(re.findall(r'Player 1 plays Rock', output))
-    paper_p1 = len(re.findall(r'Player 1 plays Paper', output))
-    scissors_p1 = len(re.findall(r'Player 1 plays Scissors', output))
-    
-    rock_p2 = len(re.findall(r'Player 2 plays Rock', output))
-    paper_p2 = len(re.findall(r'Player 2 plays Paper', output))
-    scissors_p2 = len(re.findall(r'Player 2 plays Scissors', output))
-    
-    player1_cards.update({'Rock': rock_p1, 'Paper': paper_p1, 'Scissors': scissors_p1})
-    player2_cards.update({'Rock': rock_p2, 'Paper': paper_p2, 'Scissors': scissors_p2})
-    
+    """Parse a game transcript (bytes or mmap) to extract statistics"""
+    # Extract the winner (single scan instead of one per player)
+    winner_match = _RE_WINNER.search(output)
+    winner = f"Player {winner_match.group(1).decode()}" if winner_match else "Draw"
+
+    # Extract number of moves: scan backwards for the last "Move N" rather
+    # than materializing every match just to take the final one
+    num_moves = 0
+    idx = output.rfind(b'Move ')
+    if idx >= 0:
+        move_match = _RE_MOVE.match(output, idx)
+        if move_match:
+            num_moves = int(move_match.group(1))
+
+    # Card placements: for long transcripts the JIT'd single-pass scan
+    # wins; otherwise one combined regex pass feeds a Counter keyed on
+    # (player, card). A fixed-shape (player, card) array keeps the
+    # downstream aggregation vectorized.
+    if njit is not None and len(output) >= _JIT_MIN_BYTES:
+        buf = np.frombuffer(output, dtype=np.uint8)
+        card_counts = _scan_cards_jit(buf, _TOKEN_MATRIX, _TOKEN_LENS).reshape(2, 3).astype(np.int32)
+    else:
+        plays = Counter(_RE_PLAYS.findall(output))
+        card_counts = np.array(
+            [[plays[(b'1', card.encode())] for card in CARD_LABELS],
+             [plays[(b'2', card.encode())] for card in CARD_LABELS]],
+            dtype=np.int32)
+
     return {
         'winner': winner,
         'num_moves': num_moves,
-        'player1_cards': player1_cards,
-        'player2_cards': player2_cards
+        'card_counts': card_counts
     }
 
-def generate_graphs(stats):
-    """Generate graphs from collected statistics"""
+def aggregate_stats(stats):
+    """Compute the aggregates shared by the graphs and the report once"""
+    return {
+        'num_games': len(stats),
+        'winners': Counter(game['winner'] for game in stats),
+        'card_totals': np.stack([game['card_counts'] for game in stats]).sum(axis=0),
+        'moves': [game['num_moves'] for game in stats],
+    }
+
+def generate_graphs(aggregates):
+    """Generate graphs from the precomputed aggregates"""
+    # Matplotlib import is deferred so game running and parsing don't pay
+    # for it; Agg avoids GUI backend autodetection since we only save PNGs
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
     # Ensure output directory exists
     os.makedirs(OUTPUT_DIR, exist_ok=True)
-    
+
+    # One figure reused for all three charts - Figure/Axes/canvas setup is
+    # most of the cost for plots this small
+    fig, ax = plt.subplots(figsize=(10, 6))
+
     # Winners pie chart
-    winners = Counter([game['winner'] for game in stats])
-    plt.figure(figsize=(10, 6))
-    plt.pie([winners['Player 1'], winners['Player 2'], winners['Draw']], 
-            labels=['Player 1', 'Player 2', 'Draw'],
-            autopct='%1.1f%%')
-    plt.title('Game Outcomes')
-    plt.savefig(f"{OUTPUT_DIR}/game_outcomes.png")
-    plt.close()
-    
+    winners = aggregates['winners']
+    ax.pie([winners['Player 1'], winners['Player 2'], winners['Draw']],
+           labels=['Player 1', 'Player 2', 'Draw'],
+           autopct='%1.1f%%')
+    ax.set_title('Game Outcomes')
+    fig.savefig(f"{OUTPUT_DIR}/game_outcomes.png")
+    ax.clear()
+    # ax.pie pins the aspect to equal and clear() doesn't undo that, so
+    # restore it or the following charts render as a squashed square
+    ax.set_aspect('auto')
+
     # Card type distribution
-    p1_cards = Counter()
-    p2_cards = Counter()
-    
-    for game in stats:
-        p1_cards.update(game['player1_cards'])
-        p2_cards.update(game['player2_cards'])
-    
-    labels = ['Rock', 'Paper', 'Scissors']
-    p1_values = [p1_cards[card] for card in labels]
-    p2_values = [p2_cards[card] for card in labels]
-    
-    x = range(len(labels))
+    p1_values = aggregates['card_totals'][0]
+    p2_values = aggregates['card_totals'][1]
+
+    x = range(len(CARD_LABELS))
     width = 0.35
-    
-    plt.figure(figsize=(10, 6))
-    plt.bar([i - width/2 for i in x], p1_values, width, label='Player 1')
-    plt.bar([i + width/2 for i in x], p2_values, width, label='Player 2')
-    plt.xlabel('Card Type')
-    plt.ylabel('Frequency')
-    plt.title('Card Type Distribution')
-    plt.xticks(x, labels)
-    plt.legend()
-    plt.savefig(f"{OUTPUT_DIR}/card_distribution.png")
-    plt.close()
-    
+
+    ax.bar([i - width/2 for i in x], p1_values, width, label='Player 1')
+    ax.bar([i + width/2 for i in x], p2_values, width, label='Player 2')
+    ax.set_xlabel('Card Type')
+    ax.set_ylabel('Frequency')
+    ax.set_title('Card Type Distribution')
+    ax.set_xticks(x, CARD_LABELS)
+    ax.legend()
+    fig.savefig(f"{OUTPUT_DIR}/card_distribution.png")
+    ax.clear()
+    ax.set_aspect('auto')
+
     # Number of moves histogram
-    moves = [game['num_moves'] for game in stats]
-    plt.figure(figsize=(10, 6))
-    plt.hist(moves, bins=range(min(moves), max(moves) + 2), alpha=0.7)
-    plt.xlabel('Number of Moves')
-    plt.ylabel('Frequency')
-    plt.title('Game Length Distribution')
-    plt.grid(True, alpha=0.3)
-    plt.savefig(f"{OUTPUT_DIR}/game_length.png")
-    plt.close()
-
-def generate_report(stats):
-    """Generate a text report of the statistics"""
-    winners = Counter([game['winner'] for game in stats])
-    avg_moves = sum(game['num_moves'] for game in stats) / len(stats)
-    
-    p1_cards = Counter()
-    p2_cards = Counter()
-    
-    for game in stats:
-        p1_cards.update(game['player1_cards'])
-        p2_cards.update(game['player2_cards'])
-    
+    moves = aggregates['moves']
+    ax.hist(moves, bins=range(min(moves), max(moves) + 2), alpha=0.7)
+    ax.set_xlabel('Number of Moves')
+    ax.set_ylabel('Frequency')
+    ax.set_title('Game Length Distribution')
+    ax.grid(True, alpha=0.3)
+    fig.savefig(f"{OUTPUT_DIR}/game_length.png")
+
+    plt.close(fig)
+
+def generate_report(aggregates):
+    """Generate a text report from the precomputed aggregates"""
+    num_games = aggregates['num_games']
+    winners = aggregates['winners']
+    avg_moves = sum(aggregates['moves']) / num_games
+
+    # Hoist the repeated subexpressions out of the template
+    p1_wins, p2_wins, draws = winners['Player 1'], winners['Player 2'], winners['Draw']
+    p1_cards = dict(zip(CARD_LABELS, aggregates['card_totals'][0]))
+    p2_cards = dict(zip(CARD_LABELS, aggregates['card_totals'][1]))
+
     report = f"""
 RPS Card Game Analysis Report
 ============================
-Number of games analyzed: {len(stats)}
+Number of games analyzed: {num_games}
 
 Game Outcomes:
-- Player 1 wins: {winners['Player 1']} ({winners['Player 1']/len(stats)*100:.1f}%)
-- Player 2 wins: {winners['Player 2']} ({winners['Player 2']/len(stats)*100:.1f}%)
-- Draws: {winners['Draw']} ({winners['Draw']/len(stats)*100:.1f}%)
+- Player 1 wins: {p1_wins} ({100*p1_wins/num_games:.1f}%)
+- Player 2 wins: {p2_wins} ({100*p2_wins/num_games:.1f}%)
+- Draws: {draws} ({100*draws/num_games:.1f}%)
 
 Average game length: {avg_moves:.2f} moves
 
@@ -146,10 +211,9 @@ Player 2:
 - Scissors: {p2_cards['Scissors']}
 """
     
-    # Write report to file
-    with open(f"{OUTPUT_DIR}/analysis_report.txt", 'w') as f:
-        f.write(report)
-    
+    # Write report to file in one shot
+    pathlib.Path(f"{OUTPUT_DIR}/analysis_report.txt").write_text(report)
+
     return report
 
 def main():
@@ -158,24 +222,27 @@ def main():
     
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     
+    # Run the games concurrently - each worker blocks on its subprocess,
+    # so a thread pool bounded by core count is all we need. Transcripts
+    # go into a single tar archive so N games cost one file open instead
+    # of N (tarfile isn't thread-safe, so the main loop does the writing).
     game_stats = []
-    for i in range(NUM_GAMES):
-        print(f"Game {i+1}/{NUM_GAMES}...")
-        output = run_game()
-        
-        # Save the raw output
-        with open(f"{OUTPUT_DIR}/game_{i+1}_output.txt", 'w') as f:
-            f.write(output)
-        
-        stats = parse_game_output(output)
-        game_stats.append(stats)
-        
-        # Small delay to prevent system overload
-        time.sleep(1)
-    
+    with tarfile.open(f"{OUTPUT_DIR}/games.tar", 'w') as tar, \
+         ThreadPoolExecutor(max_workers=min(NUM_GAMES, os.cpu_count() or 1)) as executor:
+        futures = {executor.submit(run_game): i + 1 for i in range(NUM_GAMES)}
+        for future in as_completed(futures):
+            game_number = futures[future]
+            output, stats = future.result()
+            info = tarfile.TarInfo(name=f"game_{game_number}_output.txt")
+            info.size = len(output)
+            tar.addfile(info, io.BytesIO(output))
+            print(f"Game {game_number}/{NUM_GAMES} complete")
+            game_stats.append(stats)
+
     print("Generating statistics and graphs...")
-    generate_graphs(game_stats)
-    report = generate_report(game_stats)
+    aggregates = aggregate_stats(game_stats)
+    generate_graphs(aggregates)
+    report = generate_report(aggregates)
     
     print("\nAnalysis complete!")
     print(report)
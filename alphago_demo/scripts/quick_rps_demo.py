@@ -8,7 +8,6 @@ and saves the output to files.
 
 import os
 import subprocess
-import time
 
 # Use absolute path to avoid confusion
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -46,7 +45,6 @@ def main():
     # Run the games
     for i in range(1, NUM_GAMES + 1):
         run_game(i)
-        time.sleep(1)  # Short delay between games
     
     print(f"\nAll demonstrations completed!")
     print(f"Output saved to {OUTPUT_DIR}/quick_demo_*.txt")
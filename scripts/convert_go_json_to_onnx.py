@@ -1,175 +1,586 @@
 # Placeholder for Python script to convert Go JSON models to ONNX 
 # Now updated to also convert PyTorch .pt models to ONNX
 
+import base64
+import functools
+import hashlib
+import importlib.metadata
+import itertools
 import json
-import torch
-import torch.nn as nn
+import shutil
+import sys
 import os
-import numpy as np
 import argparse
 
+# torch and numpy are imported lazily inside the functions that need them:
+# their module init costs hundreds of ms, which `--help`, argument errors
+# and conversion-cache hits shouldn't pay.
+
+# Prefer a fast third-party decoder for the large nested weight arrays:
+# orjson first, ujson second, stdlib json as the last resort.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
 # --- PyTorch Model Definitions ---
 # NOTE: These should ideally match the definitions used in the training script
 # (python/train_from_go_examples.py) to ensure compatibility.
 # Re-defining them here for simplicity, but consider refactoring to a shared module.
 
-class PyTorchPolicyNet(nn.Module):
-    """MLP Policy Network."""
-    def __init__(self, input_size, hidden_size, output_size):
-        super().__init__()
-        self.layer1 = nn.Linear(input_size, hidden_size)
-        self.relu = nn.ReLU()
-        self.layer2 = nn.Linear(hidden_size, output_size)
-        # Using LogSoftmax to match the training script's output for KLDivLoss
-        # If ONNX consumer expects raw logits or probabilities, adjust this.
-        self.log_softmax = nn.LogSoftmax(dim=1)
-
-    def forward(self, x):
-        x = self.layer1(x)
-        x = self.relu(x)
-        x = self.layer2(x)
-        x = self.log_softmax(x)
-        return x
-
-class PyTorchValueNet(nn.Module):
-    """MLP Value Network."""
-    def __init__(self, input_size, hidden_size):
-        super().__init__()
-        self.layer1 = nn.Linear(input_size, hidden_size)
-        self.relu = nn.ReLU()
-        self.layer2 = nn.Linear(hidden_size, 1) # Output is a single value
-        self.tanh = nn.Tanh() # Output range [-1, 1] matching training script
-
-    def forward(self, x):
-        x = self.layer1(x)
-        x = self.relu(x)
-        x = self.layer2(x)
-        x = self.tanh(x)
-        return x
+@functools.lru_cache(maxsize=1)
+def _nets():
+    """Define the model classes on first use.
+
+    Subclassing nn.Module requires torch to be imported, so the class
+    definitions live behind this factory to keep the torch import off the
+    module-load path.
+    """
+    import torch.nn as nn
+
+    class PyTorchPolicyNet(nn.Module):
+        """MLP Policy Network.
+
+        With export_logits=True (the default for ONNX export) forward returns
+        raw logits and consumers apply softmax/log_softmax themselves - the
+        exported graph is one op shorter, which matters for a micro-MLP whose
+        inference cost is mostly dispatch overhead. export_logits=False keeps
+        the LogSoftmax tail that training uses for KLDivLoss.
+        """
+        def __init__(self, input_size, hidden_size, output_size, export_logits=True):
+            super().__init__()
+            self.layer1 = nn.Linear(input_size, hidden_size)
+            self.relu = nn.ReLU()
+            self.layer2 = nn.Linear(hidden_size, output_size)
+            self.export_logits = export_logits
+            self.log_softmax = nn.LogSoftmax(dim=1)
+
+        def forward(self, x):
+            x = self.layer1(x)
+            x = self.relu(x)
+            x = self.layer2(x)
+            if self.export_logits:
+                return x
+            return self.log_softmax(x)
+
+    class PyTorchValueNet(nn.Module):
+        """MLP Value Network."""
+        def __init__(self, input_size, hidden_size):
+            super().__init__()
+            self.layer1 = nn.Linear(input_size, hidden_size)
+            self.relu = nn.ReLU()
+            self.layer2 = nn.Linear(hidden_size, 1) # Output is a single value
+            self.tanh = nn.Tanh() # Output range [-1, 1] matching training script
+
+        def forward(self, x):
+            x = self.layer1(x)
+            x = self.relu(x)
+            x = self.layer2(x)
+            x = self.tanh(x)
+            return x
+
+    return PyTorchPolicyNet, PyTorchValueNet
 
 # --- Conversion Functions ---
 
-def load_go_json_and_convert(json_path, onnx_path, model_type_str):
+@functools.lru_cache(maxsize=8)
+def _get_traced_model(model_type_str, input_size, hidden_size, output_size):
+    """Build and jit-trace a model architecture once per shape.
+
+    torch.onnx.export re-traces an eager module on every call; tracing
+    here and memoizing per (type, sizes) pays that cost once per process.
+    The traced module shares the eager module's Parameter objects, so
+    loading fresh weights into the returned module updates the traced
+    graph too.
+    """
+    import torch
+
+    PyTorchPolicyNet, PyTorchValueNet = _nets()
+    if model_type_str == "policy":
+        model = PyTorchPolicyNet(input_size, hidden_size, output_size, export_logits=True)
+        print(f"Instantiated PyTorchPolicyNet (In: {input_size}, Hidden: {hidden_size}, Out: {output_size})")
+    elif model_type_str == "value":
+        model = PyTorchValueNet(input_size, hidden_size)
+        print(f"Instantiated PyTorchValueNet (In: {input_size}, Hidden: {hidden_size}, Out: 1)")
+    else:
+        raise ValueError(f"Unknown model_type_str: {model_type_str}")
+    model.eval()
+    traced = torch.jit.trace(model, torch.randn(1, input_size))
+    return model, traced
+
+def _load_model_config(json_path):
+    """Load a Go model JSON file with the fastest decoder available."""
+    with open(json_path, 'rb') as f:
+        data = f.read()
+    if orjson is not None:
+        return orjson.loads(data)
+    if ujson is not None:
+        return ujson.loads(data)
+    return json.loads(data)
+
+def _weight_array(field, shape=None):
+    """Build a float32 array from a JSON weight field.
+
+    The Go exporter may emit a weight field either as (nested) lists of
+    floats or as a base64 string of little-endian float32 bytes. The
+    base64 form decodes with a single np.frombuffer, skipping JSON number
+    tokenization entirely; nested lists go through np.fromiter over a
+    flattened iterator, which converts straight to float32 in one pass
+    without the intermediate object-array pass (and float64 copy) that
+    np.array(list_of_lists).astype() would take.
+    """
+    import numpy as np
+
+    if isinstance(field, str):
+        # frombuffer is a zero-copy (read-only) view over the decoded
+        # bytes - fine for the direct-emit path, which only reads the
+        # array to serialize it into the ONNX initializer
+        arr = np.frombuffer(base64.b64decode(field), dtype='<f4')
+        return arr.reshape(shape) if shape is not None else arr
+    if field and isinstance(field[0], list):
+        num_rows = len(field)
+        num_cols = len(field[0])
+        flat = np.fromiter(itertools.chain.from_iterable(field), dtype=np.float32,
+                           count=num_rows * num_cols)
+        return flat.reshape(num_rows, num_cols)
+    return np.asarray(field, dtype=np.float32)
+
+def _npz_sidecar_path(abs_json_path):
+    """Return the NPZ side-car path referenced by a Go model JSON, or None.
+
+    A retrain of a side-car model rewrites only the .npz (the JSON keeps
+    just shapes and the filename), so freshness checks and cache keys
+    have to look at the NPZ too. The raw bytes are scanned for the key
+    before parsing: inline-weight JSONs can be huge, and they're exactly
+    the ones without a side-car.
+    """
+    with open(abs_json_path, 'rb') as f:
+        if b'"weights_npz"' not in f.read():
+            return None
+    # Side-car JSONs are tiny (shapes plus a filename), so a full parse
+    # here is cheap
+    model_config = _load_model_config(abs_json_path)
+    if 'weights_npz' not in model_config:
+        return None
+    return os.path.join(os.path.dirname(abs_json_path), model_config['weights_npz'])
+
+def _emit_onnx_mlp_from_weights(w1, b1, w2, b2, tail_op, onnx_path, output_name,
+                                static_batch=None):
+    """Build the 2-layer MLP ONNX graph directly from weight arrays.
+
+    Synthesizes Gemm -> Relu -> Gemm (plus an optional Tanh/LogSoftmax
+    tail) with onnx.helper, so converting a Go JSON model needs neither
+    module construction nor tracing - and no torch install at all.
+    Initializers go through numpy_helper.from_array, which packs them as
+    raw little-endian float32 bytes rather than a repeated-float protobuf
+    field. Weights are (out_features, in_features) as in the Go export,
+    handled by Gemm's transB.
+    """
+    import numpy as np
+    import onnx
+    from onnx import helper, numpy_helper, TensorProto
+
+    input_size = w1.shape[1]
+    output_size = w2.shape[0]
+
+    def _write(path, batch_dim):
+        gemm2_out = output_name if tail_op is None else "pre_tail"
+        nodes = [
+            helper.make_node("Gemm", ["input", "W1", "B1"], ["hidden"], transB=1),
+            helper.make_node("Relu", ["hidden"], ["hidden_relu"]),
+            helper.make_node("Gemm", ["hidden_relu", "W2", "B2"], [gemm2_out], transB=1),
+        ]
+        if tail_op == "Tanh":
+            nodes.append(helper.make_node("Tanh", [gemm2_out], [output_name]))
+        elif tail_op == "LogSoftmax":
+            nodes.append(helper.make_node("LogSoftmax", [gemm2_out], [output_name], axis=1))
+        elif tail_op is not None:
+            raise ValueError(f"Unknown tail_op: {tail_op}")
+
+        initializers = [
+            numpy_helper.from_array(np.ascontiguousarray(arr, dtype=np.float32), name)
+            for arr, name in ((w1, "W1"), (b1, "B1"), (w2, "W2"), (b2, "B2"))
+        ]
+        graph = helper.make_graph(
+            nodes,
+            "neural_rps_mlp",
+            [helper.make_tensor_value_info("input", TensorProto.FLOAT, [batch_dim, input_size])],
+            [helper.make_tensor_value_info(output_name, TensorProto.FLOAT, [batch_dim, output_size])],
+            initializer=initializers)
+        model = helper.make_model(
+            graph, opset_imports=[helper.make_opsetid("", 17)])
+        onnx.checker.check_model(model)
+        onnx.save(model, path)
+
+    abs_onnx_path = os.path.abspath(onnx_path)
+    _write(abs_onnx_path, "batch_size")
+    print(f"Model successfully exported to {abs_onnx_path}")
+    if static_batch:
+        root, ext = os.path.splitext(abs_onnx_path)
+        static_path = f"{root}.b{static_batch}{ext}"
+        _write(static_path, static_batch)
+        print(f"Static batch={static_batch} variant exported to {static_path}")
+
+def load_go_json_and_convert(json_path, onnx_path, model_type_str, static_batch=None):
     """
-    Loads model from Go JSON, loads weights into PyTorch model, exports to ONNX.
-    (Handles the original functionality)
+    Loads model weights from Go JSON and emits the ONNX graph directly.
+    (Handles the original functionality, without the PyTorch round-trip)
     """
     abs_json_path = os.path.abspath(json_path)
+    abs_onnx_path = os.path.abspath(onnx_path)
+
+    # Skip the export when every output file is already newer than its
+    # sources (the JSON, and the NPZ side-car when one is referenced) -
+    # graph building and serializing dominate runtime for these small
+    # nets. The static-batch sibling counts as an output too, so adding
+    # --static_batch to a previously converted model still produces it.
+    targets = [abs_onnx_path]
+    if static_batch:
+        root, ext = os.path.splitext(abs_onnx_path)
+        targets.append(f"{root}.b{static_batch}{ext}")
+    if all(os.path.exists(target) for target in targets):
+        src_mtime = os.path.getmtime(abs_json_path)
+        npz_path = _npz_sidecar_path(abs_json_path)
+        if npz_path is not None and os.path.exists(npz_path):
+            src_mtime = max(src_mtime, os.path.getmtime(npz_path))
+        if all(os.path.getmtime(target) >= src_mtime for target in targets):
+            print(f"ONNX model is up-to-date with {abs_json_path}, skipping export.")
+            return
+
+    # Deferred so the up-to-date early return above stays import-free
+    import numpy as np
+
     print(f"Loading Go model from JSON: {abs_json_path}")
-    with open(abs_json_path, 'r') as f:
-        model_config = json.load(f)
+    model_config = _load_model_config(abs_json_path)
 
     input_size = model_config["inputSize"]
     hidden_size = model_config["hiddenSize"]
 
+    # Newer Go exports ship the tensors in an NPZ side-car referenced from
+    # the JSON ("weights_npz"), so only scalar shapes go through the JSON
+    # parser and the weights are memory-mapped instead of tokenized
+    npz_weights = None
+    if 'weights_npz' in model_config:
+        npz_path = os.path.join(os.path.dirname(abs_json_path), model_config['weights_npz'])
+        print(f"Loading weights from NPZ side-car: {npz_path}")
+        npz_weights = np.load(npz_path, mmap_mode='r')
+
+    def _has(key):
+        return key in model_config or (npz_weights is not None and key in npz_weights)
+
+    def _field(key, shape=None):
+        if npz_weights is not None and key in npz_weights:
+            # Materialize out of the mmap as contiguous float32 - these
+            # are the exact bytes the ONNX initializer serializes
+            return np.ascontiguousarray(npz_weights[key], dtype=np.float32)
+        return _weight_array(model_config[key], shape)
+
     if model_type_str == "policy":
         output_size = model_config.get("outputSize", 9) # Default policy output size
-        pytorch_model = PyTorchPolicyNet(input_size, hidden_size, output_size)
-        print(f"Instantiated PyTorchPolicyNet (In: {input_size}, Hidden: {hidden_size}, Out: {output_size})")
         # --- Load Policy Weights (Assuming JSON structure) ---
         # Example keys - adjust based on your actual Go JSON export format
-        if 'weightsInputHiddenPolicy' in model_config and 'biasesHiddenPolicy' in model_config and \
-           'weightsHiddenOutputPolicy' in model_config and 'biasesOutputPolicy' in model_config:
-           
+        if _has('weightsInputHiddenPolicy') and _has('biasesHiddenPolicy') and \
+           _has('weightsHiddenOutputPolicy') and _has('biasesOutputPolicy'):
+
             print("Loading Policy weights...")
-            # Layer 1
-            w1 = np.array(model_config['weightsInputHiddenPolicy']).astype(np.float32)
-            b1 = np.array(model_config['biasesHiddenPolicy']).astype(np.float32)
-            pytorch_model.layer1.weight.data = torch.from_numpy(w1)
-            pytorch_model.layer1.bias.data = torch.from_numpy(b1)
-            # Layer 2
-            w2 = np.array(model_config['weightsHiddenOutputPolicy']).astype(np.float32)
-            b2 = np.array(model_config['biasesOutputPolicy']).astype(np.float32)
-            pytorch_model.layer2.weight.data = torch.from_numpy(w2)
-            pytorch_model.layer2.bias.data = torch.from_numpy(b2)
+            w1 = _field('weightsInputHiddenPolicy', (hidden_size, input_size))
+            b1 = _field('biasesHiddenPolicy')
+            w2 = _field('weightsHiddenOutputPolicy', (output_size, hidden_size))
+            b2 = _field('biasesOutputPolicy')
             print("Policy weights loaded from JSON.")
         else:
             print("Warning: Policy weight keys not found in JSON. Model will have initial random weights.")
+            # Same uniform(-1/sqrt(fan_in), 1/sqrt(fan_in)) scheme as the
+            # nn.Linear default the torch path used to fall back on
+            rng = np.random.default_rng()
+            bound1, bound2 = input_size ** -0.5, hidden_size ** -0.5
+            w1 = rng.uniform(-bound1, bound1, (hidden_size, input_size)).astype(np.float32)
+            b1 = rng.uniform(-bound1, bound1, hidden_size).astype(np.float32)
+            w2 = rng.uniform(-bound2, bound2, (output_size, hidden_size)).astype(np.float32)
+            b2 = rng.uniform(-bound2, bound2, output_size).astype(np.float32)
+        # Raw logits out, matching the export_logits=True torch export
+        tail_op, output_name = None, 'logits'
 
     elif model_type_str == "value":
-        output_size = 1
-        pytorch_model = PyTorchValueNet(input_size, hidden_size)
-        print(f"Instantiated PyTorchValueNet (In: {input_size}, Hidden: {hidden_size}, Out: {output_size})")
-        # --- Load Value Weights (Existing Logic) ---
         print("Loading Value weights...")
-        # Layer 1 (fc1 in original script)
-        w1 = np.array(model_config['weightsInputHidden']).astype(np.float32)
-        b1 = np.array(model_config['biasesHidden']).astype(np.float32)
-        pytorch_model.layer1.weight.data = torch.from_numpy(w1)
-        pytorch_model.layer1.bias.data = torch.from_numpy(b1)
-        # Layer 2 (fc2 in original script)
-        w2 = np.array(model_config['weightsHiddenOutput']).astype(np.float32)
-        # Go JSON 'biasOutput' is scalar, PyTorch bias is vector [1]
-        b2 = torch.tensor([model_config['biasOutput']], dtype=torch.float32)
-        pytorch_model.layer2.weight.data = torch.from_numpy(w2)
-        pytorch_model.layer2.bias.data = b2
+        # Go JSON 'biasOutput' is scalar, the graph wants a vector [1]
+        w1 = _field('weightsInputHidden', (hidden_size, input_size))
+        b1 = _field('biasesHidden')
+        w2 = _field('weightsHiddenOutput', (1, hidden_size))
+        b2 = np.array([model_config['biasOutput']], dtype=np.float32)
         print("Value weights loaded from JSON.")
+        tail_op, output_name = 'Tanh', 'output'
 
     else:
         raise ValueError(f"Unknown model_type_str: {model_type_str}")
 
-    # --- Export to ONNX ---
-    export_pytorch_model_to_onnx(pytorch_model, input_size, onnx_path, model_type_str)
+    # --- Emit ONNX directly (no torch module construction or tracing) ---
+    _emit_onnx_mlp_from_weights(w1, b1, w2, b2, tail_op, onnx_path, output_name,
+                                static_batch=static_batch)
 
-def load_pytorch_pt_and_convert(pt_path, onnx_path, pytorch_model_type, input_size, hidden_size, policy_output_size):
+def load_pytorch_pt_and_convert(pt_path, onnx_path, pytorch_model_type, input_size, hidden_size, policy_output_size, static_batch=None):
     """
     Loads a trained PyTorch model state dict from a .pt file, 
     instantiates the model, and exports it to ONNX.
     """
+    import torch
+
     abs_pt_path = os.path.abspath(pt_path)
     print(f"Loading PyTorch model state from: {abs_pt_path}")
     
     if pytorch_model_type == "policy":
         if policy_output_size is None:
             raise ValueError("--policy_output_size is required for --pytorch_model_type policy")
-        pytorch_model = PyTorchPolicyNet(input_size, hidden_size, policy_output_size)
-        print(f"Instantiated PyTorchPolicyNet (In: {input_size}, Hidden: {hidden_size}, Out: {policy_output_size})")
+        pytorch_model, traced_model = _get_traced_model("policy", input_size, hidden_size, policy_output_size)
     elif pytorch_model_type == "value":
-        pytorch_model = PyTorchValueNet(input_size, hidden_size)
-        print(f"Instantiated PyTorchValueNet (In: {input_size}, Hidden: {hidden_size}, Out: 1)")
+        pytorch_model, traced_model = _get_traced_model("value", input_size, hidden_size, 1)
     else:
         raise ValueError(f"Unknown pytorch_model_type: {pytorch_model_type}")
 
     try:
-        # Load the state dictionary
-        state_dict = torch.load(abs_pt_path, map_location=torch.device('cpu')) # Load to CPU
+        # Load the state dictionary. weights_only skips full pickle
+        # execution and mmap maps the tensor payload instead of bulk-
+        # copying it into RAM; both landed in torch 2.x, so fall back to
+        # the plain load on older builds that reject the kwargs.
+        try:
+            state_dict = torch.load(abs_pt_path, map_location="cpu",
+                                    weights_only=True, mmap=True)
+        except TypeError:
+            state_dict = torch.load(abs_pt_path, map_location="cpu")
         pytorch_model.load_state_dict(state_dict)
         print(f"Successfully loaded state dict from {abs_pt_path}")
     except Exception as e:
         print(f"Error loading state dict from {abs_pt_path}: {e}")
         raise
 
-    # --- Export to ONNX ---
-    export_pytorch_model_to_onnx(pytorch_model, input_size, onnx_path, pytorch_model_type)
+    # --- Export to ONNX (eager module for dynamo, traced for fallback) ---
+    export_pytorch_model_to_onnx(pytorch_model, input_size, onnx_path, pytorch_model_type,
+                                 static_batch=static_batch, traced_model=traced_model)
+
+def export_pytorch_model_to_onnx(pytorch_model, input_size, onnx_path, model_type_str, static_batch=None, traced_model=None):
+    """Exports a given PyTorch model to ONNX format.
+
+    Always writes the dynamic-batch model to onnx_path. When static_batch
+    is set, also writes a shape-specialized sibling (model.b{N}.onnx) with
+    no dynamic axis - fixed shapes let ORT pre-plan memory and pick
+    specialized kernels for the common serving batch size.
+
+    The TorchDynamo-based exporter is tried first on the eager module - it
+    emits a cleaner graph (no spurious Shape/Gather nodes) that ORT fuses
+    more aggressively, but it can't capture jit-traced modules. The
+    TorchScript exporter is the fallback for older torch or unsupported
+    modules; it uses traced_model when given (it shares the eager module's
+    Parameters, so both see the same weights).
+    """
+    import torch
+
+    # One small export per process - intra-op thread pool spin-up costs
+    # more than parallelism returns on a 1-batch dummy forward
+    torch.set_num_threads(1)
 
-def export_pytorch_model_to_onnx(pytorch_model, input_size, onnx_path, model_type_str):
-    """Exports a given PyTorch model to ONNX format."""
     pytorch_model.eval() # Set to evaluation mode
 
-    # Dummy input for ONNX export - Batch size 1
-    dummy_input = torch.randn(1, input_size)
-    
     abs_onnx_path = os.path.abspath(onnx_path)
     print(f"Exporting {model_type_str} model to ONNX: {abs_onnx_path}")
-    
-    try:
-        torch.onnx.export(
-            pytorch_model,
-            dummy_input,
-            abs_onnx_path,
+
+    # Policy models export raw logits (see PyTorchPolicyNet) - name the
+    # output accordingly so consumers know to apply softmax themselves
+    output_name = 'logits' if model_type_str == "policy" else 'output'
+
+    def _export(dummy_input, path, dynamic_axes):
+        try:
+            torch.onnx.export(
+                pytorch_model,
+                (dummy_input,),
+                path,
+                input_names=['input'],
+                output_names=[output_name],
+                dynamic_axes=dynamic_axes,
+                dynamo=True,
+                opset_version=18
+            )
+            return
+        except Exception as e:
+            print(f"Dynamo export unavailable ({e}); falling back to TorchScript exporter.")
+        ts_model = traced_model if traced_model is not None else pytorch_model
+        ts_kwargs = dict(
             input_names=['input'], # Standard name
-            output_names=['output'], # Standard name
-            dynamic_axes={'input': {0: 'batch_size'}, 'output': {0: 'batch_size'}},
-            opset_version=11 # Use a reasonable default opset version
+            output_names=[output_name],
+            dynamic_axes=dynamic_axes,
+            # Opset 17 is the current compatibility sweet spot; constant
+            # folding plus embedded initializers lets ORT fuse
+            # MatMul+Add into Gemm
+            opset_version=17,
+            do_constant_folding=True,
+            training=torch.onnx.TrainingMode.EVAL,
+            keep_initializers_as_inputs=False,
         )
+        try:
+            # Pin the TorchScript exporter - torch >= 2.9 defaults to the
+            # dynamo path, which would just re-run the attempt above
+            torch.onnx.export(ts_model, dummy_input, path, dynamo=False, **ts_kwargs)
+        except TypeError:
+            # torch < 2.5 has no dynamo kwarg and uses TorchScript anyway
+            torch.onnx.export(ts_model, dummy_input, path, **ts_kwargs)
+
+    try:
+        dummy_input = torch.randn(1, input_size)
+        _export(dummy_input, abs_onnx_path,
+                {'input': {0: 'batch_size'}, output_name: {0: 'batch_size'}})
         print(f"Model successfully exported to {abs_onnx_path}")
+        _pack_initializers_raw(abs_onnx_path)
+        _validate_and_stamp_onnx(abs_onnx_path, pytorch_model, dummy_input)
+
+        if static_batch:
+            root, ext = os.path.splitext(abs_onnx_path)
+            static_path = f"{root}.b{static_batch}{ext}"
+            _export(torch.randn(static_batch, input_size), static_path, None)
+            _pack_initializers_raw(static_path)
+            print(f"Static batch={static_batch} variant exported to {static_path}")
     except Exception as e:
         print(f"Error during ONNX export: {e}")
         raise
 
+def _pack_initializers_raw(onnx_path):
+    """Re-encode repeated-float initializers as packed raw bytes.
+
+    Exporters sometimes serialize weights into the repeated float_data
+    field, where every scalar pays varint framing and a parse loop on
+    load. raw_data is little-endian packed float32 that ORT can memcpy
+    straight in, so it both shrinks the file and speeds up session
+    construction. The direct-emit path already writes raw_data via
+    numpy_helper.from_array; this covers the torch.onnx.export path.
+    """
+    try:
+        import onnx
+    except ImportError:
+        return
+    import numpy as np
+
+    abs_onnx_path = os.path.abspath(onnx_path)
+    model = onnx.load(abs_onnx_path)
+    repacked = 0
+    for tensor in model.graph.initializer:
+        if tensor.data_type == onnx.TensorProto.FLOAT and tensor.float_data:
+            arr = np.asarray(tensor.float_data, dtype=np.float32)
+            tensor.ClearField("float_data")
+            tensor.raw_data = arr.tobytes()
+            repacked += 1
+    if repacked:
+        onnx.save(model, abs_onnx_path)
+        print(f"Re-encoded {repacked} float initializers as raw data in {abs_onnx_path}")
+
+def _validate_and_stamp_onnx(abs_onnx_path, pytorch_model, dummy_input, tolerance=1e-6):
+    """Check ONNX/PyTorch numerical equivalence once, at export time.
+
+    Runs a single forward through ONNX Runtime and PyTorch, then embeds
+    the max abs diff and a SHA-256 of the PyTorch parameters in the ONNX
+    metadata_props, so downstream loaders can trust the file instead of
+    re-validating on every load.
+    """
+    import numpy as np
+    import torch
+    try:
+        import onnx
+        import onnxruntime
+    except ImportError as e:
+        print(f"Skipping export validation (missing dependency: {e.name})")
+        return
+
+    sess = onnxruntime.InferenceSession(abs_onnx_path, providers=["CPUExecutionProvider"])
+    with torch.no_grad():
+        pt_out = pytorch_model(dummy_input).numpy()
+    ort_out = sess.run(None, {"input": dummy_input.numpy()})[0]
+    max_diff = float(np.abs(pt_out - ort_out).max())
+    if max_diff > tolerance:
+        print(f"Warning: ONNX output differs from PyTorch by {max_diff:.3e} (tolerance {tolerance:.0e})")
+
+    pt_sha = hashlib.sha256(
+        b"".join(p.detach().numpy().tobytes() for p in pytorch_model.parameters())).hexdigest()
+
+    model = onnx.load(abs_onnx_path)
+    for key, value in (("pt_max_diff", str(max_diff)), ("pt_sha256", pt_sha)):
+        entry = model.metadata_props.add()
+        entry.key = key
+        entry.value = value
+    onnx.save(model, abs_onnx_path)
+    print(f"Validated ONNX against PyTorch (max diff {max_diff:.3e}); metadata stamped.")
+
+# ONNX Runtime graph optimization levels, mirroring Optimum's O1/O2/O3
+_ORT_OPT_LEVELS = {
+    "O1": "ORT_ENABLE_BASIC",
+    "O2": "ORT_ENABLE_EXTENDED",
+    "O3": "ORT_ENABLE_ALL",
+}
+
+def optimize_onnx_with_ort(onnx_path, level):
+    """Run ORT graph optimization once and persist the optimized model.
+
+    Paying the fusion cost at conversion time means every consumer loads
+    an already-optimized graph instead of re-running session-level
+    optimization (or skipping it) on each load.
+    """
+    import onnxruntime as ort
+
+    abs_onnx_path = os.path.abspath(onnx_path)
+    so = ort.SessionOptions()
+    so.graph_optimization_level = getattr(ort.GraphOptimizationLevel, _ORT_OPT_LEVELS[level])
+    so.optimized_model_filepath = abs_onnx_path + ".opt.onnx"
+    # Creating the session writes the optimized graph to the side file
+    ort.InferenceSession(abs_onnx_path, so, providers=["CPUExecutionProvider"])
+    os.replace(so.optimized_model_filepath, abs_onnx_path)
+    print(f"Persisted ORT {level}-optimized graph to {abs_onnx_path}")
+
+def save_onnx_with_external_data(onnx_path):
+    """Move large initializers into a companion .data file.
+
+    Keeps the protobuf itself small (and under its 2 GB limit for big
+    hidden sizes) and lets ONNX Runtime memory-map the weight payload on
+    load instead of parsing it out of the graph.
+    """
+    import onnx
+
+    abs_onnx_path = os.path.abspath(onnx_path)
+    model = onnx.load(abs_onnx_path)
+    onnx.save_model(
+        model,
+        abs_onnx_path,
+        save_as_external_data=True,
+        all_tensors_to_one_file=True,
+        location=os.path.basename(abs_onnx_path) + ".data",
+        size_threshold=1024,
+        convert_attribute=False)
+    print(f"Initializers over 1 KiB moved to {abs_onnx_path}.data")
+
+def quantize_onnx_dynamic(onnx_path):
+    """Write an INT8 dynamically-quantized sibling next to the model.
+
+    Pure Linear+activation MLPs quantize cleanly: MatMul/Gemm weights
+    shrink 4x and fuse into QGemm. Worth benchmarking per model - for
+    tiny hidden sizes (<128) the quant/dequant overhead can outweigh the
+    win, which is why this is opt-in rather than the default.
+    """
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
+    abs_onnx_path = os.path.abspath(onnx_path)
+    int8_path = abs_onnx_path.replace(".onnx", ".int8.onnx")
+    quantize_dynamic(abs_onnx_path, int8_path,
+                     op_types_to_quantize=["MatMul", "Gemm"],
+                     weight_type=QuantType.QInt8)
+    print(f"INT8 dynamic-quantized model written to {int8_path}")
+
 # --- Main Execution --- #
 
-if __name__ == "__main__":
+def _parse_and_validate():
+    """Parse CLI arguments and check all modal requirements up front.
+
+    Runs before anything touches torch/onnx, so misuse fails fast at
+    interpreter-startup cost instead of after a heavyweight import.
+    """
     parser = argparse.ArgumentParser(description="Convert Go JSON or PyTorch .pt models to ONNX.")
     
     # --- Mode Selection ---
@@ -188,6 +599,39 @@ if __name__ == "__main__":
         required=True,
         help="Path for the output ONNX model file."
     )
+    parser.add_argument(
+        "--optimize",
+        type=str,
+        choices=sorted(_ORT_OPT_LEVELS),
+        help="Run ONNX Runtime graph optimization at this level after export "
+             "and persist the optimized model in place."
+    )
+    parser.add_argument(
+        "--static_batch",
+        type=int,
+        help="Additionally export a shape-specialized model.b{N}.onnx with "
+             "this fixed batch size (no dynamic axis)."
+    )
+    parser.add_argument(
+        "--external_data",
+        action="store_true",
+        help="Re-save the exported model with large initializers in a "
+             "companion .data file (mmap-friendly; opt-in since consumers "
+             "must ship both files)."
+    )
+    parser.add_argument(
+        "--no_cache",
+        action="store_true",
+        help="Bypass the content-addressed conversion cache under "
+             "~/.cache/neural_rps/onnx."
+    )
+    parser.add_argument(
+        "--quantize",
+        type=str,
+        choices=["dynamic"],
+        help="Additionally write an INT8 dynamically-quantized .int8.onnx "
+             "sibling (benchmark per model; small hidden sizes may regress)."
+    )
 
     # --- Go JSON Specific Arguments ---
     parser.add_argument(
@@ -252,7 +696,12 @@ if __name__ == "__main__":
         
     else:
          # Should not happen due to choices constraint, but good practice
-         parser.error(f"Invalid --input_mode: {args.input_mode}") 
+         parser.error(f"Invalid --input_mode: {args.input_mode}")
+
+    return args, input_path_for_print, model_type_for_print
+
+if __name__ == "__main__":
+    args, input_path_for_print, model_type_for_print = _parse_and_validate()
 
     # Ensure output directory exists
     abs_onnx_output_path = os.path.abspath(args.onnx_output_path)
@@ -272,10 +721,60 @@ if __name__ == "__main__":
             print(f"  Policy Out:   {args.policy_output_size}")
     print("-------------------------------")
 
+    # --- Content-addressed conversion cache ---
+    # Keyed on source bytes + CLI args + torch version, so any change that
+    # could alter the exported graph misses the cache. A hit skips model
+    # construction and export entirely.
+    #
+    # A run can produce more than the main .onnx (--static_batch,
+    # --quantize and --external_data all add siblings), so the cache
+    # carries every artifact of the run: a hit requires all of them and
+    # restores all of them.
+    artifact_root, onnx_ext = os.path.splitext(abs_onnx_output_path)
+    artifact_suffixes = [onnx_ext]
+    if args.static_batch:
+        artifact_suffixes.append(f".b{args.static_batch}{onnx_ext}")
+    if args.quantize == "dynamic":
+        artifact_suffixes.append(f".int8{onnx_ext}")
+    if args.external_data:
+        artifact_suffixes.append(f"{onnx_ext}.data")
+
+    cache_base = None
+    if not args.no_cache:
+        # Version via package metadata rather than torch.__version__ so the
+        # cache-hit fast path never imports torch
+        try:
+            torch_version = importlib.metadata.version("torch")
+        except importlib.metadata.PackageNotFoundError:
+            torch_version = "none"
+        # Hash every source of weight bytes: the input file, plus the NPZ
+        # side-car for go_json models that reference one - otherwise a
+        # retrain that rewrites only the .npz would still hit the cache
+        source_paths = [os.path.abspath(input_path_for_print)]
+        if args.input_mode == "go_json":
+            npz_path = _npz_sidecar_path(source_paths[0])
+            if npz_path is not None and os.path.exists(npz_path):
+                source_paths.append(npz_path)
+        hasher = hashlib.sha256()
+        for source_path in source_paths:
+            with open(source_path, 'rb') as f:
+                hasher.update(f.read())
+        hasher.update(repr(sorted(vars(args).items())).encode())
+        hasher.update(torch_version.encode())
+        cache_key = hasher.hexdigest()
+        cache_base = os.path.join(
+            os.path.expanduser("~/.cache/neural_rps/onnx"), cache_key)
+        if all(os.path.exists(cache_base + suffix) for suffix in artifact_suffixes):
+            for suffix in artifact_suffixes:
+                shutil.copy(cache_base + suffix, artifact_root + suffix)
+            print(f"Cache hit ({cache_key[:12]}) - copied cached ONNX artifacts to {abs_onnx_output_path}")
+            sys.exit(0)
+
     # --- Call appropriate conversion function ---
     try:
         if args.input_mode == "go_json":
-            load_go_json_and_convert(args.go_json_input_path, args.onnx_output_path, args.go_model_type)
+            load_go_json_and_convert(args.go_json_input_path, args.onnx_output_path, args.go_model_type,
+                                     static_batch=args.static_batch)
         elif args.input_mode == "pytorch_pt":
             load_pytorch_pt_and_convert(
                 args.pytorch_input_path, 
@@ -283,8 +782,19 @@ if __name__ == "__main__":
                 args.pytorch_model_type, 
                 args.input_size, 
                 args.hidden_size, 
-                args.policy_output_size # Pass None if value type
+                args.policy_output_size, # Pass None if value type
+                static_batch=args.static_batch
             )
+        if args.optimize:
+            optimize_onnx_with_ort(abs_onnx_output_path, args.optimize)
+        if args.quantize == "dynamic":
+            quantize_onnx_dynamic(abs_onnx_output_path)
+        if args.external_data:
+            save_onnx_with_external_data(abs_onnx_output_path)
+        if cache_base is not None:
+            os.makedirs(os.path.dirname(cache_base), exist_ok=True)
+            for suffix in artifact_suffixes:
+                shutil.copy(artifact_root + suffix, cache_base + suffix)
         print("\nConversion process completed successfully.")
         print(f"ONNX model saved to: {abs_onnx_output_path}")
     except Exception as e:
@@ -6,9 +6,32 @@ This script validates that the output files from all
 implementations follow the standardized format.
 """
 
+import mmap
 import os
 import sys
 import re
+from concurrent.futures import ThreadPoolExecutor
+
+# All patterns compiled once at module scope, as bytes so they can run
+# over the raw file contents without a UTF-8 decode (the outputs are
+# ASCII). The required sections are one alternation with named groups so
+# a single pass over the content finds them all.
+_RE_REQUIRED = re.compile(
+    rb"(?P<title>Neural Rock Paper Scissors|Neural Game AI)|"  # Allow alternate title for AlphaGo demo
+    rb"(?P<architecture>Network Architecture)|"
+    rb"(?P<training>Training Process)|"
+    rb"(?P<predictions>Model Predictions)"
+)
+_REQUIRED_SECTIONS = {
+    'title': "Neural Rock Paper Scissors",
+    'architecture': "Network Architecture",
+    'training': "Training Process",
+    'predictions': "Model Predictions",
+}
+_RE_HEADER = re.compile(rb"={50,}")
+_RE_VERSION = re.compile(rb"Version:")
+_RE_IMPL_TYPE = re.compile(rb"Implementation Type:")
+_RE_PREDICTION = re.compile(rb"Input: Opponent played (Rock|Paper|Scissors)")
 
 
 def validate_output(filename):
@@ -20,40 +43,42 @@ def validate_output(filename):
     elif not os.path.exists(filename):
         print(f"Error: File {filename} does not exist.")
         return False
-    
+
+    # Memory-map the file so the compiled bytes patterns scan the page
+    # cache directly instead of a heap copy of the whole log; empty files
+    # can't be mapped, so fall back to reading those
     try:
-        with open(filename, 'r') as f:
-            content = f.read()
+        with open(filename, 'rb') as f:
+            try:
+                content = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                content = f.read()
     except Exception as e:
         print(f"Error reading file {filename}: {e}")
         return False
-    
-    # Check for required sections
-    required_sections = [
-        "Neural Rock Paper Scissors|Neural Game AI",  # Allow alternate title for AlphaGo demo
-        "Network Architecture",
-        "Training Process",
-        "Model Predictions"
-    ]
-    
-    for section_pattern in required_sections:
-        if not re.search(section_pattern, content):
-            section_name = section_pattern.split('|')[0]
-            print(f"Missing section: {section_name} in {filename}")
-            return False
-    
+
+    # Check for required sections in a single pass
+    found_sections = {m.lastgroup for m in _RE_REQUIRED.finditer(content)}
+    missing_sections = set(_REQUIRED_SECTIONS) - found_sections
+    if missing_sections:
+        for group in sorted(missing_sections):
+            print(f"Missing section: {_REQUIRED_SECTIONS[group]} in {filename}")
+        return False
+
     # Check header format
-    if not re.search(r"={50,}", content):
+    if not _RE_HEADER.search(content):
         print(f"Warning: Header separator lines (=====) missing or too short in {filename}")
-    
+
     # Check for implementation info
-    if not re.search(r"Version:", content) or not re.search(r"Implementation Type:", content):
+    if not _RE_VERSION.search(content) or not _RE_IMPL_TYPE.search(content):
         print(f"Warning: Missing implementation info in {filename}")
-    
+
     # Check for model predictions format (specifically for RPS implementations)
-    if "Tic-Tac-Toe" not in content and not re.search(r"Input: Opponent played (Rock|Paper|Scissors)", content):
+    # .find() rather than `in` - mmap objects don't support subsequence
+    # membership tests
+    if content.find(b"Tic-Tac-Toe") == -1 and not _RE_PREDICTION.search(content):
         print(f"Warning: Model predictions don't follow standard format in {filename}")
-    
+
     print(f"Output format validated for {filename}")
     return True
 
@@ -67,13 +92,15 @@ def validate_all():
         "alphago_demo_output.txt"
     ]
     
-    success = True
-    for filename in output_files:
-        filepath = os.path.join("output", filename)
-        if not validate_output(filepath):
-            success = False
-    
-    return success
+    # Per-file validation is independent I/O plus regex scanning, so
+    # overlap the files with a small thread pool (bytes regex releases
+    # the GIL on large inputs)
+    with ThreadPoolExecutor(max_workers=min(8, len(output_files))) as executor:
+        results = list(executor.map(
+            lambda filename: validate_output(os.path.join("output", filename)),
+            output_files))
+
+    return all(results)
 
 
 if __name__ == "__main__":